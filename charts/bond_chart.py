@@ -20,7 +20,8 @@ def get_beyond_meat_bond_chart() -> None:
     Uses Selenium to capture a screenshot of Beyond Meat's bond price chart,
     adds a title, and saves it as an image file.
     """
-    temp_screenshot_path = os.path.join(os.path.dirname(BEYOND_MEAT_BOND_CHART_PATH), "chart_only.png")
+    # Selenium's screenshot() expects a str path, not a Path
+    temp_screenshot_path = str(BEYOND_MEAT_BOND_CHART_PATH.parent / "chart_only.png")
     
     # Setup Chrome options
     chrome_options = Options()
@@ -5,53 +5,86 @@ This module provides functions for creating financial charts for the daily brief
 """
 
 import logging
-import time
+import os
+from datetime import datetime
+import matplotlib
+# Select the non-interactive Agg backend before pyplot is imported — the
+# charts only ever go to PNG files, and Agg skips GUI-backend initialization
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import yfinance as yf
 import pandas as pd
-from config import TICKERS, CHART_STYLE, CHART_COLOR, GRID_COLOR, BACKGROUND_COLOR, CHART_DPI
+from config import TICKERS, CHART_STYLE, CHART_COLOR, GRID_COLOR, BACKGROUND_COLOR, CHART_DPI, TIMEZONE
 
-# Delay between Yahoo Finance API calls to avoid rate limiting
-YF_REQUEST_DELAY = 2  # seconds
+def _last_trading_day():
+    """Returns the most recent trading day (weekends roll back to Friday)."""
+    today = pd.Timestamp.now(TIMEZONE).normalize()
+    if today.dayofweek >= 5:  # Saturday/Sunday
+        return (today - pd.offsets.BDay(1)).date()
+    return today.date()
 
 def create_charts() -> None:
     """
     Creates charts for a set of financial tickers using yfinance data.
     Saves the charts as image files with informative titles.
+    Charts already rendered since the last trading day are left untouched.
     """
+    # Skip tickers whose chart on disk is already current — weekend runs and
+    # same-day re-runs (e.g. after an email failure) then cost nothing, since
+    # the underlying daily data cannot have changed
+    last_trading = _last_trading_day()
+    stale_tickers = {
+        ticker: info for ticker, info in TICKERS.items()
+        if not (os.path.exists(info['filename'])
+                and datetime.fromtimestamp(os.path.getmtime(info['filename'])).date() >= last_trading)
+    }
+    if not stale_tickers:
+        logging.info("All %d charts are current; skipping download and render", len(TICKERS))
+        return
+
     plt.style.use(CHART_STYLE)
 
-    for i, (ticker, info) in enumerate(TICKERS.items()):
-        # Add delay between requests to avoid Yahoo Finance rate limiting
-        if i > 0:
-            logging.info(f"Waiting {YF_REQUEST_DELAY}s before next request to avoid rate limiting...")
-            time.sleep(YF_REQUEST_DELAY)
+    # One batched download for every ticker — yfinance fans the symbols out
+    # over its own thread pool, so the fetch takes as long as the slowest
+    # symbol instead of a serial request (plus rate-limit delay) per ticker.
+    logging.info("Downloading data for %d tickers...", len(stale_tickers))
+    all_data = yf.download(
+        list(stale_tickers.keys()), period="1y",
+        group_by='ticker', threads=True, progress=False
+    )
+
+    # One figure reused for every ticker — figure/manager setup is the
+    # expensive part of pyplot, so clear the axes between charts instead of
+    # allocating and tearing down a fresh figure each time
+    fig, ax = plt.subplots(figsize=(10, 6), facecolor=BACKGROUND_COLOR)
 
-        logging.info(f"Downloading data for {info['display_name']}...")
-        data = yf.download(ticker, period="1y")
+    for ticker, info in stale_tickers.items():
+        try:
+            # Drop rows that are all-NaN — a symbol that failed to download
+            # still gets columns in the batched frame, just empty ones
+            data = all_data[ticker].dropna(how='all')
+        except KeyError:
+            data = pd.DataFrame()
         if data.empty:
             logging.warning(f"No data found for {info['display_name']}. Skipping chart creation.")
             continue
 
         logging.info(f"Plotting chart for {info['display_name']}...")
-        plt.figure(figsize=(10, 6), facecolor=BACKGROUND_COLOR)
-        ax = plt.gca()
+        ax.clear()
         ax.set_facecolor(BACKGROUND_COLOR)
-        plt.plot(data.index, data['Close'],
-                 label='Close Price',
-                 color=CHART_COLOR, linewidth=2)
-        plt.grid(True, linestyle='--', alpha=0.7, color=GRID_COLOR)
-        
+        ax.plot(data.index, data['Close'],
+                label='Close Price',
+                color=CHART_COLOR, linewidth=2)
+        ax.grid(True, linestyle='--', alpha=0.7, color=GRID_COLOR)
+
         # Annotate the most recent price
         latest_date = data.index[-1]
-        # The line below is not an error
-        # data['Close'].iloc[-1] is a Series
-        latest_price = data['Close'].iloc[-1][ticker]
-        plt.annotate(f'{latest_price:.2f}',
-                     xy=(latest_date, latest_price),
-                     xytext=(latest_date + pd.Timedelta(days=2), latest_price),
-                     fontsize=14, color=CHART_COLOR,
-                     ha='left', va='center')
+        latest_price = data['Close'].iloc[-1]
+        ax.annotate(f'{latest_price:.2f}',
+                    xy=(latest_date, latest_price),
+                    xytext=(latest_date + pd.Timedelta(days=2), latest_price),
+                    fontsize=14, color=CHART_COLOR,
+                    ha='left', va='center')
 
         # Updated titles to match the tone
         if ticker == 'BYND':
@@ -62,11 +95,12 @@ def create_charts() -> None:
             title = "S&P 500"
         else:
             title = f"{info['display_name']}"
-            
-        plt.title(title, color=CHART_COLOR, fontsize=18, pad=20, fontweight='bold')
-        
+
+        ax.set_title(title, color=CHART_COLOR, fontsize=18, pad=20, fontweight='bold')
+
         ax.tick_params(colors=CHART_COLOR, labelsize=12)
-        plt.tight_layout()
-        plt.savefig(info['filename'], dpi=CHART_DPI, bbox_inches='tight', facecolor=BACKGROUND_COLOR)
-        plt.close()
-        logging.info(f"Saved chart: {info['filename']}") 
\ No newline at end of file
+        fig.tight_layout()
+        fig.savefig(info['filename'], dpi=CHART_DPI, bbox_inches='tight', facecolor=BACKGROUND_COLOR)
+        logging.info(f"Saved chart: {info['filename']}")
+
+    plt.close(fig)
\ No newline at end of file
@@ -8,6 +8,7 @@ used throughout the application.
 
 import os
 from dotenv import load_dotenv
+from pathlib import Path
 from zoneinfo import ZoneInfo
 import sys
 from typing import List
@@ -31,12 +32,13 @@ AI_MODEL = "claude-opus-4-8"
 # Used when Anthropic is temporarily unavailable (for example, HTTP 529).
 TEXT_FALLBACK_MODEL = "gpt-5.6-sol"
 
-# Get the directory where the script is located
-SCRIPT_DIR = os.path.dirname(os.path.abspath(sys.argv[0]))
+# Get the directory where the script is located (as a Path, so derived
+# paths below are built with the / operator instead of repeated os.path.join)
+SCRIPT_DIR = Path(os.path.abspath(sys.argv[0])).parent
 
 # Log file paths
-LOG_FILE = os.path.join(SCRIPT_DIR, "daily_briefing.log")
-PROMPT_LOG_FILE = os.path.join(SCRIPT_DIR, "prompt_response.log")
+LOG_FILE = SCRIPT_DIR / "daily_briefing.log"
+PROMPT_LOG_FILE = SCRIPT_DIR / "prompt_response.log"
 
 # Define global headers for HTTP requests
 HEADERS = {
@@ -54,21 +56,21 @@ TOKEN_BUFFER = 1000  # Buffer to account for response tokens
 MAX_OUTPUT_TOKENS = 8192  # Maximum output tokens for Claude
 
 # Email template path
-TEMPLATE_PATH = os.path.join(SCRIPT_DIR, "template.html")
+TEMPLATE_PATH = SCRIPT_DIR / "template.html"
 
 # Egg Price Chart path
-EGG_PRICE_CHART_PATH = os.path.join(SCRIPT_DIR, 'egg-price-chart.png')
+EGG_PRICE_CHART_PATH = SCRIPT_DIR / 'egg-price-chart.png'
 
 # Beyond Meat Bond Chart URL
 BEYOND_MEAT_BOND_URL = "https://markets.businessinsider.com/bonds/beyond_meat_incdl-zero_convnts_202227-bond-2027-us08862eab56"
-BEYOND_MEAT_BOND_CHART_PATH = os.path.join(SCRIPT_DIR, 'beyond-meat-bond-chart.png')
+BEYOND_MEAT_BOND_CHART_PATH = SCRIPT_DIR / 'beyond-meat-bond-chart.png'
 
 # Update the chart paths dictionary
 CHART_PATHS = {
-    'bynd-chart.png': os.path.join(SCRIPT_DIR, 'bynd-chart.png'),
+    'bynd-chart.png': SCRIPT_DIR / 'bynd-chart.png',
     'beyond-meat-bond-chart.png': BEYOND_MEAT_BOND_CHART_PATH,
-    'otly-chart.png': os.path.join(SCRIPT_DIR, 'otly-chart.png'),
-    'sp500-chart.png': os.path.join(SCRIPT_DIR, 'sp500-chart.png'),
+    'otly-chart.png': SCRIPT_DIR / 'otly-chart.png',
+    'sp500-chart.png': SCRIPT_DIR / 'sp500-chart.png',
     'egg-price-chart.png': EGG_PRICE_CHART_PATH,
 }
 
@@ -94,6 +96,74 @@ USER_PERSONALITY = "a philanthropist funding farmed animal advocacy nonprofits a
 # Newsletter tone settings
 NEWSLETTER_TONE = "conversational and engaging - like a well-informed colleague, who has experienced the ups and downs of market cycles and overhyped startups and doesn't easily get excited, giving you updates. Avoid the the gratuitous use of similes and metaphors."
 
+# System prompt template for the final Axios-style newsletter call.
+# Built once at import time — only {current_date} is substituted per run.
+AXIOS_SYSTEM_PROMPT_TEMPLATE = (
+    f"You are writing 'Future Appetite' - a daily newsletter for {USER_PERSONALITY}. "
+    f"Create a sharp, scannable newsletter highlighting the TOP 3 stories using Smart Brevity principles. "
+
+    "\n\n=== SMART BREVITY WRITING STYLE ==="
+    "\nEvery word must earn its place. Write like a sharp, well-informed colleague."
+    "\n"
+    "\n• Lead with the news, not background"
+    "\n• Short sentences (under 20 words)"
+    "\n• Active voice: 'Company launched X' not 'X was launched'"
+    "\n• Specific details: numbers, names, dates"
+    "\n• Skip hype: if source says 'revolutionary,' you say 'new'"
+    "\n• No throat-clearing phrases"
+    "\n• Skeptical but fair"
+
+    "\n\n=== STORY SELECTION (exactly 3) ==="
+    "\nYou MUST pick exactly one story from each topic:"
+    "\n• Story 1: Alternative Protein"
+    "\n• Story 2: Vegan Movement"
+    "\n• Story 3: AI"
+    "\n"
+    "\nWithin each topic, pick the story that is most actionable, timely, and significant."
+    "\nDo NOT invent stories or reassign stories from one topic to another. Only use the news items provided for each topic."
+
+    "\n\n=== FORMAT FOR EACH STORY ==="
+    "\n"
+    "\n1. HEADLINE: 5-8 words, convey the core news"
+    "\n"
+    "\n2. THREE BULLETS with these exact labels:"
+    "\n   • 'What' - The news in 1-2 crisp sentences"
+    "\n   • 'Why it matters' - The 'so what' for this reader"
+    "\n   • 'Go deeper' - Source attribution with link (or email sender/subject)"
+    "\n"
+    "\n3. IMAGE DESCRIPTION: For AI image generation"
+    "\n"
+    "\n4. CAPTION: One line for the image"
+
+    "\n\n=== INTRO ==="
+    "\nToday is {current_date}."
+    "\nStart with a bold greeting using the current day like '<strong>Happy Tuesday!</strong>' or similar."
+    "\nThen one sentence teasing what's in this edition."
+    "\nExample: '<strong>Happy Tuesday!</strong> Big retail moves in alt-protein today, plus an AI tool worth knowing.'"
+
+    "\n\n=== SUBJECT LINE ==="
+    "\nHighlight your top story. Under 50 characters."
+    "\nGood: 'Oatly Stock Hits 52-Week Low'"
+    "\nBad: 'Your Daily Update: News and More'"
+
+    "\n\n=== ACCURACY ==="
+    "\nDo NOT expand acronyms or abbreviations unless the expansion is explicitly stated in the source material. "
+    "If an acronym appears without its expansion, use the acronym as-is without guessing what it stands for."
+
+    "\n\n=== LINK FORMATTING ==="
+    "\nUse HTML: <a href=\"URL\">source name</a>"
+    "\nFor emails: mention sender and subject (no link needed)"
+
+    "\n\n=== IMAGE GUIDELINES ==="
+    "\nCreate photorealistic image descriptions (2-3 sentences)."
+    "\n• Write prompts that produce images looking like real photographs"
+    "\n• Include specific details: lighting, angle, setting, subjects"
+    "\n• Think: professional news photography, documentary style"
+    "\n• Describe realistic scenes with natural compositions"
+    "\n• AVOID: text, logos, charts, obvious AI artifacts"
+    "\n• Caption: brief, written as if describing a real photo"
+)
+
 # Common prompt elements that apply to all sections
 COMMON_PROMPT_ELEMENTS = (
     "Your task is to identify the most important news items "
@@ -156,7 +226,7 @@ CHART_DPI = 300
 IMAP_SERVER = "imap.gmail.com"
 IMAP_PORT = 993
 SMTP_SERVER = "smtp.gmail.com"
-SMTP_PORT = 587
+SMTP_PORT = 465  # Implicit TLS (SMTP_SSL) — skips the STARTTLS upgrade round trip
 
 # Dedicated news source URLs
 GREEN_QUEEN_SITEMAP_URL = "https://www.greenqueen.com.hk/sitemap_index.xml"
@@ -5,13 +5,17 @@ This module provides functions for interacting with the Anthropic API (Claude)
 and OpenAI API (for image generation), including rate limiting, retries, and token counting.
 """
 
+import functools
+import hashlib
 import logging
+import re
 import random
 import time
-import json
+import orjson
 from typing import List, Dict, Any, Type
-from openai import OpenAI
-from anthropic import Anthropic
+from diskcache import Cache
+from openai import OpenAI, RateLimitError as OpenAIRateLimitError
+from anthropic import Anthropic, RateLimitError as AnthropicRateLimitError
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
@@ -19,9 +23,54 @@ from config import (
     AI_MODEL, MAX_RETRIES, INITIAL_RETRY_DELAY, MAX_RETRY_DELAY,
     MAX_TOKENS_PER_REQUEST, TIMEZONE, IMAGE_MODEL, IMAGE_SIZE,
     IMAGE_QUALITY, IMAGE_OUTPUT_FORMAT, MAX_OUTPUT_TOKENS,
-    TEXT_FALLBACK_MODEL
+    TEXT_FALLBACK_MODEL, SCRIPT_DIR
 )
 
+# On-disk cache of structured LLM responses, keyed by the exact request.
+# A re-run within the TTL (e.g. after a chart or email failure) replays
+# the parsed responses instead of paying for the API calls again.
+LLM_CACHE_TTL = 86400  # seconds
+_llm_cache = Cache(str(SCRIPT_DIR / "llm_cache"))
+
+# Matches a response wrapped in a markdown code fence (```json ... ```)
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*\n(.*?)\n```\s*$', re.DOTALL)
+
+# Minimal OpenAI-style wrappers so callers can keep reading
+# response.choices[0].message.parsed from the Claude path. Defined once at
+# module scope — the class statements used to execute inside
+# call_claude_parse_with_backoff, creating three new types per call.
+class _ParsedMessage:
+    def __init__(self, parsed):
+        self.parsed = parsed
+
+class _ParsedChoice:
+    def __init__(self, parsed):
+        self.message = _ParsedMessage(parsed)
+
+class _ParsedResponse:
+    def __init__(self, parsed):
+        self.choices = [_ParsedChoice(parsed)]
+
+def _llm_cache_key(model: str, messages: List[Dict[str, str]], response_model: Type[BaseModel]) -> str:
+    """Builds a stable cache key from the model, messages, and response schema."""
+    payload = orjson.dumps({"model": model, "messages": messages}, option=orjson.OPT_SORT_KEYS)
+    digest = hashlib.sha256(payload).hexdigest()
+    return f"{response_model.__name__}:{digest}"
+
+@functools.lru_cache(maxsize=64)
+def _schema_instruction(response_model: Type[BaseModel]) -> str:
+    """
+    Builds the JSON-schema instruction appended to the system prompt for a
+    response model. Cached per model class — schema generation plus the
+    indented dump is pure-Python work that never changes between calls.
+    """
+    schema = response_model.model_json_schema()
+    return (
+        f"\n\nYou must respond with valid JSON that matches this schema:\n"
+        f"```json\n{orjson.dumps(schema, option=orjson.OPT_INDENT_2).decode()}\n```\n"
+        f"Respond ONLY with the JSON, no additional text."
+    )
+
 def num_tokens_from_string(string: str, model: str = "claude-opus-4-5-20251101") -> int:
     """
     Returns an approximate number of tokens in a text string.
@@ -37,6 +86,40 @@ def num_tokens_from_string(string: str, model: str = "claude-opus-4-5-20251101")
     # This is a rough approximation
     return len(string) // 4
 
+def _is_rate_limit_error(e: Exception) -> bool:
+    """
+    Determines whether an exception is a rate-limit error.
+
+    Checks the typed SDK exceptions and the status code first so the common
+    case never has to stringify the exception; the substring match only runs
+    for errors that arrive without either.
+    """
+    if isinstance(e, (OpenAIRateLimitError, AnthropicRateLimitError)):
+        return True
+    if getattr(e, 'status_code', None) == 429:
+        return True
+    error_text = str(e).lower()
+    return "rate limit" in error_text or "rate_limit" in error_text
+
+def _is_retryable_error(e: Exception) -> bool:
+    """
+    Determines whether an API error is transient and worth retrying.
+
+    Retryable: rate limits (429), server errors and overload (5xx/529),
+    timeouts, and connection failures. Everything else (authentication,
+    invalid request, etc.) will fail the same way on every attempt, so
+    retrying only wastes the backoff window.
+    """
+    status_code = getattr(e, 'status_code', None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+
+    error_text = str(e).lower()
+    return any(marker in error_text for marker in (
+        "rate limit", "rate_limit", "timeout", "timed out",
+        "connection", "overloaded", "server error", "service unavailable"
+    ))
+
 def call_api_with_backoff(
     api_call: callable,
     resource_type: str = "completions",
@@ -46,7 +129,8 @@ def call_api_with_backoff(
 ) -> Any:
     """
     Makes an API call with exponential backoff for retries.
-    Handles rate limits and errors.
+    Retries transient errors (rate limits, server errors, timeouts) and
+    raises immediately on permanent ones.
 
     Args:
         api_call: A callable that makes the actual API call
@@ -59,11 +143,9 @@ def call_api_with_backoff(
         The API response
     """
     retry_count = 0
+    delay = initial_retry_delay
     while retry_count < max_retries:
         try:
-            # Add jitter to avoid synchronized retries
-            jitter = random.uniform(0.8, 1.2)
-
             # Make the API call
             response = api_call()
             return response
@@ -71,12 +153,14 @@ def call_api_with_backoff(
         except Exception as e:
             retry_count += 1
 
+            if not _is_retryable_error(e):
+                # Permanent errors (auth, invalid request, ...) won't succeed
+                # on retry — surface them immediately instead of backing off.
+                logging.error(f"Non-retryable API error with {resource_type}: {str(e)}")
+                raise
+
             # Check if it's a rate limit error
-            is_rate_limit = (
-                hasattr(e, 'status_code') and e.status_code == 429 or
-                "rate limit" in str(e).lower() or
-                "rate_limit" in str(e).lower()
-            )
+            is_rate_limit = _is_rate_limit_error(e)
 
             if is_rate_limit:
                 logging.warning(f"{resource_type} rate limit exceeded. Attempt {retry_count}/{max_retries}")
@@ -87,8 +171,27 @@ def call_api_with_backoff(
                 logging.error(f"Max retries reached. Giving up on {resource_type} request.")
                 raise
 
-            # Calculate backoff with jitter
-            delay = min(initial_retry_delay * (2 ** (retry_count - 1)) * jitter, max_retry_delay)
+            # Decorrelated jitter (AWS-style): draw the next delay uniformly
+            # from [initial, previous * 3]. Unlike multiplicative jitter on a
+            # 2**n schedule, concurrent workers don't cluster their retries
+            # around the same instants, which matters now that sections fan
+            # out in parallel against a shared rate limit.
+            delay = min(max_retry_delay, random.uniform(initial_retry_delay, delay * 3))
+
+            # On 429s, prefer the server's own timing over our guess — both
+            # SDKs attach the HTTP response to the exception, and Retry-After
+            # says exactly when the rate-limit window resets, avoiding both
+            # over-waiting and a doomed early retry.
+            if is_rate_limit:
+                headers = getattr(getattr(e, 'response', None), 'headers', None) or {}
+                retry_after = headers.get('retry-after')
+                if retry_after:
+                    try:
+                        delay = min(float(retry_after), max_retry_delay)
+                        logging.info(f"Using server-provided Retry-After of {delay:.2f}s")
+                    except ValueError:
+                        pass
+
             logging.info(f"Retrying {resource_type} request in {delay:.2f} seconds...")
             time.sleep(delay)
 
@@ -239,92 +342,76 @@ def call_claude_parse_with_backoff(
         An object with a structure similar to OpenAI's parse response
         for compatibility with existing code
     """
-    # Extract system prompt from messages if present
-    system_prompt = None
-    claude_messages = []
+    # Serve an identical recent request straight from the on-disk cache
+    cache_key = _llm_cache_key(model, messages, response_model)
+    parsed_model = _llm_cache.get(cache_key)
 
-    for msg in messages:
-        if msg["role"] == "system":
-            system_prompt = msg["content"]
-        else:
-            claude_messages.append(msg)
+    if parsed_model is not None:
+        logging.info(f"LLM cache hit for {response_model.__name__} — skipping API call")
+    else:
+        # Extract system prompt from messages if present
+        system_prompt = None
+        claude_messages = []
 
-    # Get the JSON schema from the Pydantic model
-    schema = response_model.model_json_schema()
+        for msg in messages:
+            if msg["role"] == "system":
+                system_prompt = msg["content"]
+            else:
+                claude_messages.append(msg)
 
-    # Add instruction to return JSON matching the schema
-    schema_instruction = (
-        f"\n\nYou must respond with valid JSON that matches this schema:\n"
-        f"```json\n{json.dumps(schema, indent=2)}\n```\n"
-        f"Respond ONLY with the JSON, no additional text."
-    )
+        # Add instruction to return JSON matching the schema (cached per model)
+        schema_instruction = _schema_instruction(response_model)
 
-    if system_prompt:
-        system_prompt += schema_instruction
-    else:
-        system_prompt = schema_instruction
+        if system_prompt:
+            system_prompt += schema_instruction
+        else:
+            system_prompt = schema_instruction
 
-    # Count tokens in the request (approximate)
-    total_tokens = sum(num_tokens_from_string(msg["content"]) for msg in claude_messages)
-    total_tokens += num_tokens_from_string(system_prompt)
+        # Count tokens in the request (approximate)
+        total_tokens = sum(num_tokens_from_string(msg["content"]) for msg in claude_messages)
+        total_tokens += num_tokens_from_string(system_prompt)
 
-    if total_tokens > MAX_TOKENS_PER_REQUEST:
-        logging.warning(f"Request too large ({total_tokens} tokens). This may exceed limits.")
+        if total_tokens > MAX_TOKENS_PER_REQUEST:
+            logging.warning(f"Request too large ({total_tokens} tokens). This may exceed limits.")
 
-    # Make the API call
-    def api_call():
-        return client.messages.create(
-            model=model,
-            max_tokens=max_tokens,
-            system=system_prompt,
-            messages=claude_messages
+        # Make the API call
+        def api_call():
+            return client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                system=system_prompt,
+                messages=claude_messages
+            )
+
+        response = call_api_with_backoff(
+            api_call=api_call,
+            resource_type="completions"
         )
 
-    response = call_api_with_backoff(
-        api_call=api_call,
-        resource_type="completions"
-    )
+        # Extract the text content from Claude's response
+        response_text = response.content[0].text
 
-    # Extract the text content from Claude's response
-    response_text = response.content[0].text
-
-    # Clean up the response - remove markdown code blocks if present
-    if response_text.startswith("```"):
-        # Remove opening code block
-        lines = response_text.split("\n")
-        if lines[0].startswith("```"):
-            lines = lines[1:]
-        # Remove closing code block
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        response_text = "\n".join(lines)
-
-    # Parse the JSON response into the Pydantic model
-    try:
-        parsed_data = json.loads(response_text)
-        parsed_model = response_model.model_validate(parsed_data)
-    except json.JSONDecodeError as e:
-        logging.error(f"Failed to parse JSON response: {e}")
-        logging.error(f"Response text: {response_text[:500]}...")
-        raise
-    except Exception as e:
-        logging.error(f"Failed to validate response against model: {e}")
-        raise
-
-    # Create a response object that mimics OpenAI's structure for compatibility
-    class ParsedMessage:
-        def __init__(self, parsed):
-            self.parsed = parsed
-
-    class ParsedChoice:
-        def __init__(self, parsed):
-            self.message = ParsedMessage(parsed)
-
-    class ParsedResponse:
-        def __init__(self, parsed):
-            self.choices = [ParsedChoice(parsed)]
-
-    return ParsedResponse(parsed_model)
+        # Clean up the response - strip a wrapping markdown code fence in a
+        # single precompiled-regex pass instead of a split/slice/join cycle
+        fence_match = _FENCE_RE.match(response_text)
+        if fence_match:
+            response_text = fence_match.group(1)
+
+        # Parse and validate the JSON response in a single pass.
+        # model_validate_json parses straight into the model, avoiding the
+        # intermediate dict tree json.loads + model_validate would build.
+        try:
+            parsed_model = response_model.model_validate_json(response_text)
+        except Exception as e:
+            logging.error(f"Failed to parse/validate response against model: {e}")
+            logging.error(f"Response text: {response_text[:500]}...")
+            raise
+
+        # Only validated responses make it into the cache
+        _llm_cache.set(cache_key, parsed_model, expire=LLM_CACHE_TTL)
+
+    # Wrap in the OpenAI-style response shape for compatibility
+    return _ParsedResponse(parsed_model)
 
 # Alias for backward compatibility
 def call_openai_parse_with_backoff(
@@ -367,6 +454,11 @@ def call_openai_parse_with_backoff(
             resource_type="OpenAI fallback completions"
         )
 
+# Days the collection window reaches back from today's 6am cutoff, indexed
+# by weekday (Mon=0..Sun=6). Monday/Saturday/Sunday roll back to Friday 6am
+# so weekend content isn't lost; Tuesday-Friday cover the previous day.
+_DAYS_BACK_BY_WEEKDAY = (3, 1, 1, 1, 1, 1, 2)
+
 def get_content_collection_timeframe():
     """
     Determines the appropriate timeframe for content collection based on the current day.
@@ -380,20 +472,7 @@ def get_content_collection_timeframe():
     # Set end time to 6am today
     end_datetime = now.replace(hour=6, minute=0, second=0, microsecond=0)
 
-    # Determine start date based on current day of the week
-    weekday = now.weekday()  # 0=Monday, 6=Sunday
-
-    # If today is Saturday (5), Sunday (6), or Monday (0)
-    if weekday in [0, 5, 6]:
-        # Go back to Friday 6am (or previous Friday if it's already past 6am on Friday)
-        days_to_friday = {
-            0: 3,  # Monday -> go back 3 days to Friday
-            5: 1,  # Saturday -> go back 1 day to Friday
-            6: 2,  # Sunday -> go back 2 days to Friday
-        }
-        start_datetime = end_datetime - timedelta(days=days_to_friday[weekday])
-    else:
-        # For Tuesday through Friday, just go back 1 day (to 6am yesterday)
-        start_datetime = end_datetime - timedelta(days=1)
+    # Look up how far back the window reaches for today's weekday
+    start_datetime = end_datetime - timedelta(days=_DAYS_BACK_BY_WEEKDAY[now.weekday()])
 
     return start_datetime, end_datetime
@@ -6,7 +6,11 @@ This module provides functions for sending emails with the daily briefing conten
 
 import logging
 import smtplib
+import ssl
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email import policy
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.image import MIMEImage
@@ -18,7 +22,18 @@ from config import (
     TIMEZONE
 )
 
-def send_email(html_content: str, subject: str = None, send_to_everyone: bool = False, 
+def _remove_temp_images(image_paths: List[str]) -> None:
+    """Deletes temporary story image files (EAFP — no stat before the remove)."""
+    for image_path in image_paths:
+        try:
+            os.remove(image_path)
+            logging.info(f"Removed temporary image file: {image_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Error removing temporary image file: {e}")
+
+def send_email(html_content: str, subject: str = None, send_to_everyone: bool = False,
                additional_images: Optional[Dict[str, str]] = None) -> bool:
     """
     Sends an email with the daily briefing content.
@@ -50,8 +65,9 @@ def send_email(html_content: str, subject: str = None, send_to_everyone: bool =
     bcc_recipients = RECIPIENT_EMAILS if send_to_everyone else []
     
     try:
-        # Create message container
-        msg = MIMEMultipart('related')
+        # Create message container (SMTP policy gives correct CRLF line endings
+        # and lets send_message serialize straight to bytes)
+        msg = MIMEMultipart('related', policy=policy.SMTP)
         msg['Subject'] = email_subject
         msg['From'] = GOOGLE_USERNAME
         msg['To'] = to_address
@@ -64,51 +80,67 @@ def send_email(html_content: str, subject: str = None, send_to_everyone: bool =
         html_part = MIMEText(html_content, 'html')
         msg_alternative.attach(html_part)
         
-        # Attach chart images
+        # Collect the chart and generated-image attachments as
+        # (full_path, content_id, filename) specs first
+        attachment_specs = []
         for image_path, content_id in CHART_CONTENT_IDS.items():
             full_path = CHART_PATHS.get(image_path)
-            if full_path and os.path.exists(full_path):
-                with open(full_path, 'rb') as img_file:
-                    img = MIMEImage(img_file.read())
-                    img.add_header('Content-ID', content_id)
-                    img.add_header('Content-Disposition', 'inline', filename=image_path)
-                    msg.attach(img)
+            if full_path:
+                attachment_specs.append((full_path, content_id, image_path))
             else:
-                logging.warning(f"Image file not found: {full_path}")
-        
-        # Attach DALL-E generated images
+                logging.warning(f"No chart path configured for: {image_path}")
+
         if additional_images:
             for image_id, image_path in additional_images.items():
-                if os.path.exists(image_path):
-                    with open(image_path, 'rb') as img_file:
-                        img = MIMEImage(img_file.read())
-                        img.add_header('Content-ID', f'<{image_id}>')
-                        img.add_header('Content-Disposition', 'inline', filename=os.path.basename(image_path))
-                        msg.attach(img)
-                else:
-                    logging.warning(f"DALL-E image file not found: {image_path}")
+                attachment_specs.append((image_path, f'<{image_id}>', os.path.basename(image_path)))
+
+        def read_image(spec):
+            """Reads one attachment; returns None (with a warning) if missing."""
+            # EAFP: opening directly avoids a separate exists() stat per file
+            # and the race between the check and the read
+            try:
+                with open(spec[0], 'rb') as img_file:
+                    return img_file.read()
+            except FileNotFoundError:
+                logging.warning(f"Image file not found: {spec[0]}")
+                return None
+
+        # Read all the image files in parallel to overlap disk I/O, then
+        # build and attach the MIME parts in order
+        if attachment_specs:
+            with ThreadPoolExecutor(max_workers=len(attachment_specs)) as executor:
+                image_datas = list(executor.map(read_image, attachment_specs))
+            for (full_path, content_id, filename), image_data in zip(attachment_specs, image_datas):
+                if image_data is None:
+                    continue
+                img = MIMEImage(image_data)
+                img.add_header('Content-ID', content_id)
+                img.add_header('Content-Disposition', 'inline', filename=filename)
+                msg.attach(img)
         
-        # Connect to SMTP server
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
+        # Connect to SMTP server over implicit TLS (port 465). This avoids the
+        # EHLO -> STARTTLS -> EHLO upgrade dance that plain SMTP on 587 needs.
+        server = smtplib.SMTP_SSL(SMTP_SERVER, SMTP_PORT, context=ssl.create_default_context())
         server.login(GOOGLE_USERNAME, GOOGLE_PASSWORD)
         
-        # Send email - include both To and Bcc recipients in the sendmail call
+        # Send email - include both To and Bcc recipients in the envelope.
+        # send_message serializes the MIME tree directly to bytes, avoiding the
+        # str round trip as_string() forces on the (mostly base64) payload.
         all_recipients = recipients + bcc_recipients
-        server.sendmail(GOOGLE_USERNAME, all_recipients, msg.as_string())
+        server.send_message(msg, from_addr=GOOGLE_USERNAME, to_addrs=all_recipients)
         server.quit()
         
         logging.info(f"Email sent successfully to {len(all_recipients)} recipient(s)")
         
-        # Clean up temporary image files
+        # Clean up the temporary images off the critical path — they're dead
+        # the moment the send completes, so the caller shouldn't wait on
+        # per-file disk latency. Non-daemon so the deletes still finish
+        # before interpreter shutdown.
         if additional_images:
-            for image_path in additional_images.values():
-                try:
-                    if os.path.exists(image_path):
-                        os.remove(image_path)
-                        logging.info(f"Removed temporary image file: {image_path}")
-                except Exception as e:
-                    logging.warning(f"Error removing temporary image file: {e}")
+            threading.Thread(
+                target=_remove_temp_images,
+                args=(list(additional_images.values()),),
+            ).start()
         
         return True
         
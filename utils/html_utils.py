@@ -6,10 +6,15 @@ This module provides functions for generating HTML content for the email newslet
 
 import re
 import logging
-from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 from typing import List, Dict, Optional, Union
 from models.data_models import ContentElement, AxiosNewsletterResponse
 
+# Compiled once at import — clean_html_content runs per fetched article, and
+# compiling (or even cache-looking-up) the patterns there is wasted work
+_WHITESPACE_RE = re.compile(r'\s+')
+_TAG_RE = re.compile(r'<[^>]*>')
+
 
 def generate_email_html(template: str, newsletter_content: Union[List[ContentElement], AxiosNewsletterResponse], image_paths: Optional[Dict[str, str]] = None) -> str:
     """
@@ -43,32 +48,34 @@ def _generate_axios_html(template: str, axios_response: AxiosNewsletterResponse,
     Returns:
         str: Generated HTML content
     """
-    newsletter_html = ""
+    # Accumulate HTML fragments in a list and join once at the end —
+    # repeated += on a growing string is O(n^2) in the total output length
+    parts = []
 
     # Add intro paragraph with bold lead-in
     if axios_response.intro:
-        newsletter_html += f'<p class="intro-text">{axios_response.intro}</p>\n'
+        parts.append(f'<p class="intro-text">{axios_response.intro}</p>\n')
 
     # Generate HTML for each story
     num_stories = len(axios_response.stories)
     for i, story in enumerate(axios_response.stories):
         is_last = (i == num_stories - 1)
         if is_last:
-            story_html = '<div class="story-section" style="border-bottom:none;padding-bottom:0;">\n'
+            parts.append('<div class="story-section" style="border-bottom:none;padding-bottom:0;">\n')
         else:
-            story_html = '<div class="story-section">\n'
+            parts.append('<div class="story-section">\n')
 
         # Story header with consistent numbering: "1. Headline", "2. Headline", "3. Headline"
-        story_html += f'  <h2 class="story-header"><span class="story-number">{i + 1}.</span> {story.headline}</h2>\n'
+        parts.append(f'  <h2 class="story-header"><span class="story-number">{i + 1}.</span> {story.headline}</h2>\n')
 
         # Add image right after headline (like Axios)
         image_id = f"story_image_{i + 1}"
         if image_paths and image_id in image_paths:
-            story_html += f'  <img class="story-image" src="cid:{image_id}" alt="{story.headline}">\n'
+            parts.append(f'  <img class="story-image" src="cid:{image_id}" alt="{story.headline}">\n')
             if story.image_caption:
-                story_html += f'  <p class="image-caption">{story.image_caption}</p>\n'
+                parts.append(f'  <p class="image-caption">{story.image_caption}</p>\n')
 
-        story_html += '  <div class="story-content">\n'
+        parts.append('  <div class="story-content">\n')
 
         # Convert bullets to flowing paragraphs with bold lead-ins
         for bullet in story.bullets:
@@ -76,15 +83,16 @@ def _generate_axios_html(template: str, axios_response: AxiosNewsletterResponse,
             label = bullet.label.rstrip(':')
 
             # All bullets become paragraphs with bold lead-ins
-            story_html += f'    <p><strong>{label}:</strong> {bullet.text}</p>\n'
+            parts.append(f'    <p><strong>{label}:</strong> {bullet.text}</p>\n')
 
-        story_html += '  </div>\n'
-        story_html += '</div>\n'
-        newsletter_html += story_html
+        parts.append('  </div>\n')
+        parts.append('</div>\n')
 
     # Add closing if present
     if axios_response.closing:
-        newsletter_html += f'<p style="margin-top: 24px;">{axios_response.closing}</p>\n'
+        parts.append(f'<p style="margin-top: 24px;">{axios_response.closing}</p>\n')
+
+    newsletter_html = "".join(parts)
 
     # Replace the newsletter content placeholder
     html = template.replace("{newsletter_content}", newsletter_html)
@@ -103,13 +111,14 @@ def _generate_legacy_html(template: str, newsletter_elements: List[ContentElemen
     Returns:
         str: Generated HTML content
     """
-    newsletter_html = ""
+    # Same list+join idiom as the Axios path to avoid quadratic concatenation
+    parts = []
 
     for element in newsletter_elements:
         if element.type == "heading":
-            newsletter_html += f"<h2>{element.content}</h2>\n"
+            parts.append(f"<h2>{element.content}</h2>\n")
         elif element.type == "paragraph":
-            newsletter_html += f"<p>{element.content}</p>\n"
+            parts.append(f"<p>{element.content}</p>\n")
         elif element.type == "image_description":
             # For image descriptions, we'll add a div with the image
             image_id = element.content
@@ -119,7 +128,9 @@ def _generate_legacy_html(template: str, newsletter_elements: List[ContentElemen
             if element.caption:
                 caption_html = f'<p class="image-caption"><em>{element.caption}</em></p>'
 
-            newsletter_html += f'<div class="generated-image"><img src="cid:{image_id}" alt="Generated image related to newsletter content" style="width:100%;max-width:800px;height:auto;margin:15px auto;display:block;border-radius:8px;">{caption_html}</div>\n'
+            parts.append(f'<div class="generated-image"><img src="cid:{image_id}" alt="Generated image related to newsletter content" style="width:100%;max-width:800px;height:auto;margin:15px auto;display:block;border-radius:8px;">{caption_html}</div>\n')
+
+    newsletter_html = "".join(parts)
 
     # Replace the newsletter content placeholder with the actual newsletter text
     html = template.replace("{newsletter_content}", newsletter_html)
@@ -140,30 +151,24 @@ def clean_html_content(html_content: str) -> str:
         return ""
     
     try:
-        # Parse HTML
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
+        # selectolax parses and extracts text in C, far faster than building
+        # a BeautifulSoup tree. Only the text is returned, so the old
+        # class/id/style attribute stripping is unnecessary.
+        tree = HTMLParser(html_content)
+
         # Remove unnecessary tags completely
-        for tag in soup.find_all(['style', 'script', 'svg', 'iframe']):
-            tag.decompose()
-        
-        # Remove all class, id, and style attributes
-        for tag in soup.find_all(True):
-            if tag.has_attr('class'):
-                del tag['class']
-            if tag.has_attr('id'):
-                del tag['id']
-            if tag.has_attr('style'):
-                del tag['style']
-        
+        for node in tree.css('style, script, svg, iframe'):
+            node.decompose()
+
         # Get text with minimal formatting
-        text = soup.get_text(separator=' ', strip=True)
-        
+        body = tree.body
+        text = body.text(separator=' ', strip=True) if body else ""
+
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
+        text = _WHITESPACE_RE.sub(' ', text)
+
         return text.strip()
     except Exception as e:
         logging.warning(f"Error cleaning HTML content: {e}")
         # Fall back to a simpler approach
-        return re.sub(r'<[^>]*>', ' ', html_content).strip() 
\ No newline at end of file
+        return _TAG_RE.sub(' ', html_content).strip()
\ No newline at end of file
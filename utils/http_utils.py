@@ -0,0 +1,50 @@
+"""
+HTTP utilities for the Daily Briefing application.
+
+This module provides a shared requests session with connection pooling and
+on-disk response caching. Cached responses are revalidated with
+If-None-Match / If-Modified-Since, so unchanged sitemaps and articles come
+back as cheap 304s instead of full downloads on repeated runs.
+"""
+
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
+from config import HEADERS, SCRIPT_DIR
+
+# Worker count shared by the content modules that fan fetches out over threads
+MAX_FETCH_WORKERS = 8
+
+# Per-request timeout (seconds) — without one a stalled remote host can
+# hang a fetch thread (and the whole run) indefinitely
+HTTP_TIMEOUT = 15
+
+# On-disk cache location and freshness window
+HTTP_CACHE_PATH = SCRIPT_DIR / "briefing_http_cache"
+HTTP_CACHE_EXPIRE = 3600  # seconds before a cached response must revalidate
+
+# Shared session: sqlite-backed response cache with conditional-request
+# revalidation, plus a connection pool sized for the thread fan-out.
+http_session = CachedSession(
+    cache_name=str(HTTP_CACHE_PATH),
+    backend='sqlite',
+    expire_after=HTTP_CACHE_EXPIRE,
+    cache_control=True,
+)
+http_session.headers.update(HEADERS)
+# Retry transient failures (connection errors, 429s, 5xx) with exponential
+# backoff at the transport layer, so every fetcher gets the same retry
+# policy the API helpers already apply to LLM calls.
+_retries = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET", "HEAD"),
+)
+_adapter = HTTPAdapter(
+    pool_connections=MAX_FETCH_WORKERS,
+    pool_maxsize=MAX_FETCH_WORKERS,
+    max_retries=_retries,
+)
+http_session.mount("https://", _adapter)
+http_session.mount("http://", _adapter)
@@ -4,16 +4,30 @@ Logging configuration for the Daily Briefing application.
 This module sets up logging for the application, including console and file handlers.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 from config import LOG_FILE, PROMPT_LOG_FILE
 
 def setup_logging():
     """
     Configure logging to log to both console and file.
-    
+
+    Prompt/response records are routed through a QueueHandler to a
+    background QueueListener, so the multi-KB prompt writes happen off
+    the caller's thread instead of blocking on synchronous disk I/O.
+
     Returns:
         tuple: A tuple containing (main_logger, prompt_logger)
     """
+    # None of the formats reference thread/process fields, so skip
+    # collecting them when each LogRecord is built — this runs on every
+    # log call, including the multi-KB prompt records.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Configure main logger
     logging.basicConfig(
         level=logging.INFO,
@@ -23,19 +37,28 @@ def setup_logging():
             logging.FileHandler(LOG_FILE, encoding='utf-8')
         ]
     )
-    
+
     # Create a custom logger for prompts and responses
     prompt_logger = logging.getLogger('prompts')
     prompt_logger.setLevel(logging.INFO)
-    
+
     # Create a separate log file for prompts and LLM outputs
     prompt_file_handler = logging.FileHandler(PROMPT_LOG_FILE, encoding='utf-8')
     prompt_file_handler.setFormatter(logging.Formatter('%(asctime)s\n%(message)s\n'))
-    prompt_logger.addHandler(prompt_file_handler)
-    
+
+    # Producers enqueue records and return immediately; the listener thread
+    # drains the queue into the file handler in the background.
+    log_queue = queue.Queue(-1)
+    prompt_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, prompt_file_handler)
+    listener.start()
+
+    # Flush any queued records before the interpreter exits
+    atexit.register(listener.stop)
+
     # Prevent prompt logs from propagating to the root logger
     prompt_logger.propagate = False
-    
+
     return logging.getLogger(), prompt_logger
 
 def log_section_prompt(prompt_logger, section_title, prompt, user_content):